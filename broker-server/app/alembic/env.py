@@ -73,8 +73,25 @@ async def run_migrations_online() -> None:
     await connectable.dispose()
 
 
+def run_migrations_with_shared_connection() -> None:
+    """
+    Run migrations in 'online' mode, reusing a caller-provided connection if any.
+
+    Test suites and multi-schema setups that invoke Alembic repeatedly can pass
+    an already open synchronous-style connection via
+    `config.attributes["connection"]` (e.g. from inside `AsyncConnection.run_sync`).
+    This avoids creating a new engine and paying a full connection handshake
+    on every command.
+    """
+    connection = config.attributes.get("connection", None)
+    if connection is None:
+        asyncio.run(run_migrations_online())
+    else:
+        do_run_migrations(connection)
+
+
 # Entry point: decide whether to run in offline or online mode
 if context.is_offline_mode():
     run_migrations_offline()
 else:
-    asyncio.run(run_migrations_online())
+    run_migrations_with_shared_connection()
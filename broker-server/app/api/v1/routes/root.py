@@ -1,18 +1,37 @@
-from fastapi import APIRouter, Depends, Form, Request, status
+from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import RedirectResponse
 
-from api.deps import RoleServiceDep, UserServiceDep
-from utils.security import hash_password, verify_password
+from api.deps import UserServiceDep
+from core.templates import templates
+from utils.security import (
+    DUMMY_HASH,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
 
 router = APIRouter(prefix="")
 
+# Неизменяемая часть контекста страниц форм
+_REGISTER_CTX = {"error": None, "title": "Регистрация", "user": None}
+_LOGIN_CTX = {"error": None, "title": "Вход", "user": None}
+
+_SEE_OTHER = 303
+
+
+def _see_other(url: str) -> RedirectResponse:
+    return RedirectResponse(url=url, status_code=_SEE_OTHER)
+
 
 # ----------------------
-# Главная страница — всегда редирект на /login
+# Главная страница — всегда редирект на /login.
+# Обычный Starlette-маршрут: без разбора зависимостей и обработки ответа FastAPI
 # ----------------------
-@router.get("/")
-async def index():
-    return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
+async def index(request: Request) -> RedirectResponse:
+    return _see_other("/login")
+
+
+router.add_route("/", index, methods=["GET"], include_in_schema=False)
 
 
 # ----------------------
@@ -20,9 +39,8 @@ async def index():
 # ----------------------
 @router.get("/register")
 async def register_page(request: Request):
-    return request.app.state.templates.TemplateResponse(
-        "register.html",
-        {"request": request, "error": None, "title": "Регистрация", "user": None},
+    return templates.TemplateResponse(
+        "register.html", {"request": request, **_REGISTER_CTX}
     )
 
 
@@ -42,15 +60,14 @@ async def register_post(
         error = "Пользователь с таким логином уже существует"
 
     if error:
-        return request.app.state.templates.TemplateResponse(
-            "register.html",
-            {"request": request, "error": error, "title": "Регистрация", "user": None},
+        return templates.TemplateResponse(
+            "register.html", {"request": request, **_REGISTER_CTX, "error": error}
         )
 
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password_async(password)
     await user_service.create(username, hashed_password)
-    # commit внутри сервиса или здесь
-    return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
+    await user_service.db.commit()
+    return _see_other("/login")
 
 
 # ----------------------
@@ -58,10 +75,7 @@ async def register_post(
 # ----------------------
 @router.get("/login")
 async def login_page(request: Request):
-    return request.app.state.templates.TemplateResponse(
-        "login.html",
-        {"request": request, "error": None, "title": "Вход", "user": None},
-    )
+    return templates.TemplateResponse("login.html", {"request": request, **_LOGIN_CTX})
 
 
 @router.post("/login")
@@ -72,21 +86,23 @@ async def login_post(
     user_service: UserServiceDep = Depends(),
 ):
     user = await user_service.get_by_login(login)
-    if not user or not verify_password(password, user.hashed_password):
-        return request.app.state.templates.TemplateResponse(
+    password_hash = user.hashed_password if user else DUMMY_HASH
+    password_ok = await verify_password_async(password, password_hash)
+    if not user or not password_ok:
+        return templates.TemplateResponse(
             "login.html",
-            {
-                "request": request,
-                "error": "Неверный логин или пароль",
-                "title": "Вход",
-                "user": None,
-            },
+            {"request": request, **_LOGIN_CTX, "error": "Неверный логин или пароль"},
         )
 
+    # Прозрачно переводим старые хеши (bcrypt, прежние параметры argon2)
+    # на текущие настройки, пока открытый пароль известен
+    hashed_password = None
+    if password_needs_rehash(user.hashed_password):
+        hashed_password = await hash_password_async(password)
+    await user_service.touch_last_login(user.id, hashed_password=hashed_password)
+
     # TODO: установить сессию/куки
-    return RedirectResponse(
-        url=f"/user/{user.id}", status_code=status.HTTP_303_SEE_OTHER
-    )
+    return _see_other(f"/user/{user.id}")
 
 
 # ----------------------
@@ -96,9 +112,9 @@ async def login_post(
 async def user_profile(
     request: Request, user_id: int, user_service: UserServiceDep = Depends()
 ):
-    user = await user_service.get_by_id(user_id)
+    user = await user_service.get_by_id_with_roles(user_id)
     if not user:
-        return request.app.state.templates.TemplateResponse(
+        return templates.TemplateResponse(
             "error.html",
             {
                 "request": request,
@@ -108,7 +124,7 @@ async def user_profile(
             },
             status_code=404,
         )
-    return request.app.state.templates.TemplateResponse(
+    return templates.TemplateResponse(
         "profile.html",
         {"request": request, "user": user, "title": f"Профиль {user.login}"},
     )
@@ -118,10 +134,9 @@ async def user_profile(
 # Админка
 # ----------------------
 @router.get("/admin")
-async def admin_page(request: Request, role_service: RoleServiceDep = Depends()):
-    admin_role = await role_service.get_by_name("admin")
-    users = admin_role.users if admin_role else []
-    return request.app.state.templates.TemplateResponse(
+async def admin_page(request: Request, user_service: UserServiceDep = Depends()):
+    users = await user_service.get_by_role_name("admin")
+    return templates.TemplateResponse(
         "admin.html",
         {"request": request, "users": users, "title": "Админка", "user": None},
     )
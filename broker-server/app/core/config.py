@@ -1,5 +1,6 @@
 # core/config.py (existing, minor fix: use async_database_url in db.py)
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -20,10 +21,19 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_NAME: str
     MAX_DB_CONNECTION_RETRIES: int = 10
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_TCP_KEEPALIVES_IDLE: int = 30
+    DB_STATEMENT_CACHE_SIZE: int = 1024
     CHAINLIT_APP_URL: str
     APP_DATA_DIR_NAME: str
     APP_NAME: str
     PROCESS_NAME: str
+    STATIC_CACHE_MAX_AGE: int = 86400
+    ARGON2_TIME_COST: int = 1
+    ARGON2_MEMORY_KB: int = 47104
+    ARGON2_PARALLELISM: int = 1
     LOG_LEVEL: str = "INFO"
     LOG_ROTATION: str = "1 day"
     LOG_RETENTION: str = "1 month"
@@ -44,21 +54,19 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
-    @property
+    @cached_property
     def log_file_path(self) -> Path:
         today = datetime.now().strftime("%d-%m-%Y")
         return self.LOG_DIR / f"{today}.log"
 
-    @property
+    @cached_property
     def data_dir(self) -> Path:
-        if not hasattr(self, "_data_dir"):
-            if self.APP_DATA_DIR_NAME is None:
-                raise ValueError("APP_DATA_DIR_NAME is not set")
-            self._data_dir = Path.cwd() / self.APP_DATA_DIR_NAME
-            if not self._data_dir.exists():
-                raise ValueError(f"Data directory does not exist: {self._data_dir}")
-        return self._data_dir
+        if self.APP_DATA_DIR_NAME is None:
+            raise ValueError("APP_DATA_DIR_NAME is not set")
+        data_dir = Path.cwd() / self.APP_DATA_DIR_NAME
+        if not data_dir.exists():
+            raise ValueError(f"Data directory does not exist: {data_dir}")
+        return data_dir
 
 
 settings: Settings = Settings()
-print(settings.database_url)
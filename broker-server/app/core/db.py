@@ -1,11 +1,5 @@
-# core/db.py (existing, no changes needed for now)
-from sqlalchemy.ext.asyncio import (
-    AsyncEngine,
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
-from sqlalchemy.orm import DeclarativeBase
+# core/db.py
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from core.config import settings
 from models.db import Base
 
@@ -14,21 +8,33 @@ engine = create_async_engine(
     settings.async_database_url,  # Используем async_database_url из settings
     echo=settings.LOG_LEVEL == "DEBUG",
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        # Кеш подготовленных выражений asyncpg на соединение (по умолчанию 100)
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # TCP keepalive: мёртвые соединения обнаруживаются за секунды, а не по таймауту
+        "server_settings": {
+            "tcp_keepalives_idle": str(settings.DB_TCP_KEEPALIVES_IDLE),
+            "tcp_keepalives_interval": "10",
+            "tcp_keepalives_count": "3",
+        },
+    },
 )
 AsyncSessionLocal = async_sessionmaker(
     engine,
-    class_=AsyncSession,
     expire_on_commit=False,
-    autocommit=False,
     autoflush=False,
 )
 
-# Зависимость для получения сессии (используется в эндпоинтах)
+# Зависимость для получения сессии (используется в эндпоинтах).
+# Не коммитит сама: читающие запросы не платят за COMMIT,
+# пишущие эндпоинты/сервисы коммитят явно
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
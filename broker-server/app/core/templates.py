@@ -0,0 +1,27 @@
+# core/templates.py
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from core.config import settings
+
+_debug = settings.LOG_LEVEL.upper() == "DEBUG"
+
+# В продакшене кешируем байткод на диске в общем для всех воркеров каталоге:
+# шаблон компилируется один раз
+_bytecode_cache = None
+if not _debug:
+    cache_dir = settings.data_dir / ".jinja_cache"
+    cache_dir.mkdir(exist_ok=True)
+    _bytecode_cache = FileSystemBytecodeCache(directory=str(cache_dir))
+
+# Единый экземпляр шаблонов на процесс: скомпилированные шаблоны держатся
+# в памяти (cache_size), а без DEBUG не проверяется mtime файлов
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(str(settings.data_dir / "templates")),
+        autoescape=True,
+        auto_reload=_debug,
+        cache_size=400,
+        bytecode_cache=_bytecode_cache,
+    )
+)
@@ -1,25 +1,44 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.db import Role, User
-from services.role_service import RoleService
-from services.user_service import UserService
-from utils.security import hash_password, verify_password
+from models.db import Role, User, user_roles
+from utils.security import hash_password_async
 
 
 async def create_default_admin(session: AsyncSession):
-    role_svc = RoleService(session)
-    user_svc = UserService(session)
+    # Всё в одной транзакции; вставки идемпотентны (ON CONFLICT DO NOTHING)
+    async with session.begin():
+        # Создаем роль admin
+        stmt = (
+            pg_insert(Role)
+            .values(name="admin")
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Role.id)
+        )
+        role_id = (await session.execute(stmt)).scalar_one_or_none()
+        if role_id is None:
+            stmt = select(Role.id).where(Role.name == "admin")
+            role_id = (await session.execute(stmt)).scalar_one()
 
-    # Создаем роль admin
-    admin_role = await role_svc.get_by_name("admin")
-    if not admin_role:
-        admin_role = await role_svc.create("admin")
-        await session.commit()
+        # Создаем пользователя admin (хеш считаем, только если его нет)
+        stmt = select(User.id).where(User.login == "admin")
+        if (await session.execute(stmt)).scalar_one_or_none() is not None:
+            return
 
-    # Создаем пользователя admin
-    admin_user = await user_svc.get_by_login("admin")
-    if not admin_user:
-        hashed = hash_password("admin123")  # пароль по умолчанию
-        admin_user = await user_svc.create("admin", hashed)
-        await user_svc.add_role_to_user(admin_user.id, admin_role.id)
-        await session.commit()
+        hashed = await hash_password_async("admin123")  # пароль по умолчанию
+        stmt = (
+            pg_insert(User)
+            .values(login="admin", hashed_password=hashed)
+            .on_conflict_do_nothing(index_elements=["login"])
+            .returning(User.id)
+        )
+        user_id = (await session.execute(stmt)).scalar_one_or_none()
+        if user_id is None:
+            return
+
+        await session.execute(
+            pg_insert(user_roles)
+            .values(user_id=user_id, role_id=role_id)
+            .on_conflict_do_nothing()
+        )
@@ -1,9 +1,10 @@
 import asyncio
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from setproctitle import setproctitle
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -11,7 +12,9 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from api.v1.router import api_router
 from core.config import settings
 from core.db import AsyncSessionLocal, engine
+from core.templates import templates
 from dev.first_run import create_default_admin
+from utils.static_files import CachedStaticFiles
 
 setproctitle(settings.PROCESS_NAME)
 
@@ -21,9 +24,18 @@ async def lifespan(app: FastAPI):
     """
     Lifespan приложения: инициализация ресурсов и их закрытие.
     """
-    app.state.templates = Jinja2Templates(
-        directory=str(settings.data_dir / "templates")
-    )
+    app.state.templates = templates
+
+    # Компилируем шаблоны заранее: первая страница (в том числе страница
+    # ошибки под нагрузкой) не платит за разбор и компиляцию
+    for name in (
+        "error.html",
+        "login.html",
+        "register.html",
+        "profile.html",
+        "admin.html",
+    ):
+        templates.get_template(name)
 
     # Создаем админа, если его нет
     async with AsyncSessionLocal() as session:
@@ -34,27 +46,56 @@ async def lifespan(app: FastAPI):
     await engine.dispose()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Сжимаем ответы от 1 КБ (HTML-страницы, JSON)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 app.mount(
     "/static",
-    StaticFiles(directory=str(settings.data_dir / "static")),
+    CachedStaticFiles(
+        directory=str(settings.data_dir / "static"),
+        max_age=settings.STATIC_CACHE_MAX_AGE,
+    ),
     name="static",
 )
 
 app.include_router(api_router)
 
+HTTP_ERROR_MESSAGES = {
+    404: "Страница не найдена",
+    403: "Доступ запрещён",
+    500: "Внутренняя ошибка сервера",
+    502: "Плохой шлюз",
+}
+
+# Отрендеренные страницы ошибок: зависят только от (code, message)
+_error_pages: dict[tuple[int, str], bytes] = {}
+
+
+def render_error_page(code: int, message: str) -> HTMLResponse:
+    """
+    Возвращает страницу ошибки, рендеря шаблон один раз на пару (code, message).
+    """
+    content = _error_pages.get((code, message))
+    if content is None:
+        content = (
+            templates.get_template("error.html")
+            .render(code=code, message=message)
+            .encode()
+        )
+        _error_pages[(code, message)] = content
+    return HTMLResponse(content, status_code=code)
+
 
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-    messages = {
-        404: "Страница не найдена",
-        403: "Доступ запрещён",
-        500: "Внутренняя ошибка сервера",
-        502: "Плохой шлюз",
-    }
-    message = messages.get(exc.status_code, exc.detail or "Произошла ошибка")
-    return request.app.state.templates.TemplateResponse(
+    message = HTTP_ERROR_MESSAGES.get(exc.status_code)
+    if message is not None:
+        return render_error_page(exc.status_code, message)
+
+    message = exc.detail or "Произошла ошибка"
+    return templates.TemplateResponse(
         "error.html",
         {"request": request, "code": exc.status_code, "message": message},
         status_code=exc.status_code,
@@ -64,15 +105,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     print(f"Unhandled exception: {exc}")
-    return request.app.state.templates.TemplateResponse(
-        "error.html",
-        {
-            "request": request,
-            "code": 500,
-            "message": "Произошла внутренняя ошибка сервера",
-        },
-        status_code=500,
-    )
+    return render_error_page(500, "Произошла внутренняя ошибка сервера")
 
 
 if __name__ == "__main__":
@@ -85,5 +118,11 @@ if __name__ == "__main__":
         port=settings.SERVER_PORT,
         reload=settings.LOG_LEVEL.upper() == "DEBUG",
         log_level=settings.LOG_LEVEL.lower(),
-        workers=settings.SERVER_WORKERS,
+        # SERVER_WORKERS=0 — по воркеру на ядро (async-воркеру больше не нужно).
+        # У каждого воркера свой пул БД: всего до
+        # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) соединений — держите это
+        # значение ниже max_connections Postgres
+        workers=settings.SERVER_WORKERS or os.cpu_count() or 1,
+        loop="uvloop",
+        http="httptools",
     )
@@ -3,12 +3,36 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table, func
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+)
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    configure_mappers,
+    mapped_column,
+    relationship,
+)
 
 
 class Base(DeclarativeBase):
-    pass
+    # Стабильные имена ограничений для autogenerate в Alembic
+    metadata = MetaData(
+        naming_convention={
+            "ix": "ix_%(column_0_label)s",
+            "uq": "uq_%(table_name)s_%(column_0_name)s",
+            "ck": "ck_%(table_name)s_%(constraint_name)s",
+            "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+            "pk": "pk_%(table_name)s",
+        }
+    )
 
 
 user_roles = Table(
@@ -26,7 +50,7 @@ user_roles = Table(
 class User(Base):
     __tablename__ = "users"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     login: Mapped[str] = mapped_column(
         String(64), unique=True, nullable=False, index=True
     )
@@ -38,11 +62,13 @@ class User(Base):
     )
     last_login: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
+    # Роли не грузятся неявно (lazy="raise"): запросы, которым они нужны,
+    # подключают selectinload(User.roles)
     roles: Mapped[List["Role"]] = relationship(
         "Role",
         secondary=user_roles,
         back_populates="users",
-        lazy="selectin",
+        lazy="raise",
         passive_deletes=True,
     )
 
@@ -53,7 +79,7 @@ class User(Base):
 class Role(Base):
     __tablename__ = "roles"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(
         String(50), unique=True, nullable=False, index=True
     )
@@ -62,9 +88,14 @@ class Role(Base):
         "User",
         secondary=user_roles,
         back_populates="roles",
-        lazy="selectin",
+        lazy="raise",
         passive_deletes=True,
     )
 
     def __repr__(self) -> str:
         return f"<Role {self.name!r}>"
+
+
+# Конфигурируем мапперы при импорте: ошибки в связях всплывут сразу,
+# а не на первом запросе
+configure_mappers()
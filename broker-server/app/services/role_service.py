@@ -33,9 +33,11 @@ class RoleService:
     async def update(self, role_id: int, name: str) -> Optional[Role]:
         stmt = update(Role).where(Role.id == role_id).values(name=name).returning(Role)
         result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()  # Нет commit — get_db сделает
+        await self.db.commit()
+        return result.scalar_one_or_none()
 
     async def delete(self, role_id: int) -> bool:
         stmt = delete(Role).where(Role.id == role_id)
         result = await self.db.execute(stmt)
-        return result.rowcount > 0  # Нет commit
+        await self.db.commit()
+        return result.rowcount > 0
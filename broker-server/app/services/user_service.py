@@ -1,11 +1,12 @@
 # services/user_service.py (completed with full CRUD)
 from typing import List, Optional
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from models.db import User
-from services.role_service import RoleService
+from models.db import Role, User, user_roles
 
 
 class UserService:
@@ -21,74 +22,28 @@ class UserService:
         result = await self.db.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
-    async def get_all(self) -> List[User]:
-        result = await self.db.execute(select(User))
-        return result.scalars().all()
-
-    async def create(self, login: str, hashed_password: str) -> User:
-        user = User(login=login, hashed_password=hashed_password)
-        self.db.add(user)
-        await self.db.flush()
-        await self.db.refresh(user)
-        return user
-
-    async def update(
-        self,
-        user_id: int,
-        login: Optional[str] = None,
-        hashed_password: Optional[str] = None,
-        is_active: Optional[bool] = None,
-    ) -> Optional[User]:
-        updates = {}
-        if login is not None:
-            updates["login"] = login
-        if hashed_password is not None:
-            updates["hashed_password"] = hashed_password
-        if is_active is not None:
-            updates["is_active"] = is_active
-        if not updates:
-            return await self.get_by_id(user_id)
-        stmt = update(User).where(User.id == user_id).values(**updates).returning(User)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()  # Нет commit
-
-    async def delete(self, user_id: int) -> bool:
-        stmt = delete(User).where(User.id == user_id)
+    async def get_by_id_with_roles(self, user_id: int) -> Optional[User]:
+        stmt = select(User).where(User.id == user_id).options(selectinload(User.roles))
         result = await self.db.execute(stmt)
-        return result.rowcount > 0  # Нет commit
-
-    # Additional methods for role management
-    async def add_role_to_user(self, user_id: int, role_id: int) -> bool:
-        user = await self.get_by_id(user_id)
-        role = await RoleService(self.db).get_by_id(role_id)
-        if user and role and role not in user.roles:
-            user.roles.append(role)
-            await self.db.flush()  # Flush для M2M, если нужно сразу увидеть изменения
-            return True
-        return False
-
-    async def remove_role_from_user(self, user_id: int, role_id: int) -> bool:
-        user = await self.get_by_id(user_id)
-        role = await RoleService(self.db).get_by_id(role_id)
-        if user and role and role in user.roles:
-            user.roles.remove(role)
-            await self.db.flush()
-            return True
-        return False
-
-    def __init__(self, db: AsyncSession):
-        self.db = db
-
-    async def get_by_login(self, login: str) -> Optional[User]:
-        result = await self.db.execute(select(User).where(User.login == login))
-        return result.scalar_one_or_none()
-
-    async def get_by_id(self, user_id: int) -> Optional[User]:
-        result = await self.db.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
     async def get_all(self) -> List[User]:
-        result = await self.db.execute(select(User))
+        stmt = (
+            select(User)
+            .options(selectinload(User.roles))
+            .execution_options(yield_per=200)
+        )
+        result = await self.db.stream_scalars(stmt)
+        return [user async for user in result]
+
+    async def get_by_role_name(self, role_name: str) -> List[User]:
+        stmt = (
+            select(User)
+            .join(User.roles)
+            .where(Role.name == role_name)
+            .options(selectinload(User.roles))
+        )
+        result = await self.db.execute(stmt)
         return result.scalars().all()
 
     async def create(self, login: str, hashed_password: str) -> User:
@@ -119,6 +74,18 @@ class UserService:
         await self.db.commit()
         return result.scalar_one_or_none()
 
+    async def touch_last_login(
+        self, user_id: int, hashed_password: Optional[str] = None
+    ) -> None:
+        # Одна UPDATE и один COMMIT на вход, без предварительной загрузки
+        # пользователя; перехешированный пароль пишется той же командой
+        values = {"last_login": func.now()}
+        if hashed_password is not None:
+            values["hashed_password"] = hashed_password
+        stmt = update(User).where(User.id == user_id).values(**values)
+        await self.db.execute(stmt)
+        await self.db.commit()
+
     async def delete(self, user_id: int) -> bool:
         stmt = delete(User).where(User.id == user_id)
         result = await self.db.execute(stmt)
@@ -127,19 +94,21 @@ class UserService:
 
     # Additional methods for role management
     async def add_role_to_user(self, user_id: int, role_id: int) -> bool:
-        user = await self.get_by_id(user_id)
-        role = await RoleService(self.db).get_by_id(role_id)
-        if user and role and role not in user.roles:
-            user.roles.append(role)
-            await self.db.flush()
-            return True
-        return False
+        # Один INSERT вместо загрузки пользователя и роли; несуществующие id
+        # отклонит внешний ключ
+        stmt = (
+            pg_insert(user_roles)
+            .values(user_id=user_id, role_id=role_id)
+            .on_conflict_do_nothing()
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return result.rowcount > 0
 
     async def remove_role_from_user(self, user_id: int, role_id: int) -> bool:
-        user = await self.get_by_id(user_id)
-        role = await RoleService(self.db).get_by_id(role_id)
-        if user and role and role in user.roles:
-            user.roles.remove(role)
-            await self.db.flush()
-            return True
-        return False
+        stmt = delete(user_roles).where(
+            user_roles.c.user_id == user_id, user_roles.c.role_id == role_id
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return result.rowcount > 0
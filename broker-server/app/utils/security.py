@@ -1,19 +1,88 @@
 # utils/security.py
-from passlib.context import CryptContext
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-# Контекст для хеширования паролей
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+import bcrypt
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
+
+from core.config import settings
+
+# Хешер паролей: argon2-cffi напрямую, без диспетчеризации passlib.
+# Argon2id; параметры задаются в настройках (по умолчанию минимум OWASP:
+# m=46 MiB, t=1, p=1). Больше памяти/итераций — выше стойкость, но и время
+# ответа /login; старые хеши с другими параметрами продолжают проверяться
+password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_KB,
+    parallelism=settings.ARGON2_PARALLELISM,
+    hash_len=32,
+    salt_len=16,
+    type=Type.ID,
+)
+
+# Отдельный пул потоков для KDF: хеширование паролей не занимает
+# пул по умолчанию, которым пользуются другие задачи
+_password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="password-hash"
+)
 
 
 def hash_password(password: str) -> str:
     """
     Хеширует пароль для хранения в БД.
     """
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Проверяет соответствие введенного пароля и хеша из БД.
+
+    Хеши, созданные до перехода на argon2 (bcrypt), проверяются через bcrypt.
+    """
+    if not hashed_password.startswith("$argon2"):
+        try:
+            return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        except ValueError:
+            return False
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Нужно ли перехешировать пароль: хеш bcrypt или argon2 с устаревшими параметрами.
+    """
+    if not hashed_password.startswith("$argon2"):
+        return True
+    try:
+        return password_hasher.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Хеширует пароль в отдельном потоке, не блокируя event loop.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Проверяет пароль в отдельном потоке, не блокируя event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+# Хеш-заглушка для несуществующих пользователей: проверка пароля при входе
+# занимает одинаковое время независимо от того, найден ли логин
+DUMMY_HASH = hash_password("!invalid_user_password_placeholder!")
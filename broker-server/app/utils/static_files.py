@@ -0,0 +1,23 @@
+# utils/static_files.py
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles с заголовком Cache-Control.
+
+    ETag и Last-Modified StaticFiles выставляет сам, поэтому после истечения
+    max-age браузер получает 304 Not Modified без повторной передачи файла.
+    """
+
+    def __init__(self, *args, max_age: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache_control = f"public, max-age={max_age}"
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers.setdefault("Cache-Control", self.cache_control)
+        return response
@@ -1,6 +1,7 @@
 # src/core/config.py
 from __future__ import annotations
 
+from functools import cache
 from pathlib import Path
 
 from pydantic import Field
@@ -8,6 +9,8 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class LLMSettings(BaseSettings):
+    model_config = SettingsConfigDict(frozen=True)
+
     base_url: str = Field(default="http://localhost:1236/v1", alias="LLM_BASE_URL")
     model: str = Field(default="", alias="LLM_MODEL")
     temperature: float = Field(default=0.7, alias="LLM_TEMPERATURE")
@@ -21,6 +24,7 @@ class Settings(BaseSettings):
         env_file=Path(__file__).resolve().parents[2] / ".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
     app_name: str = Field(default="chat-workflow", alias="APP_NAME")
@@ -28,7 +32,10 @@ class Settings(BaseSettings):
 
     db_url: str = Field(..., alias="DB_URL")
 
-    llm: LLMSettings = LLMSettings()
+    llm: LLMSettings = Field(default_factory=LLMSettings)
 
 
-settings = Settings()
+@cache
+def get_settings() -> Settings:
+    # parsed lazily on first use, then shared
+    return Settings()
@@ -1,16 +1,46 @@
 # src/infrastructure/db/database.py
 from __future__ import annotations
 
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Any
+
+import orjson
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+
+def _json_serializer(obj: Any) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
 
 
 class Database:
 
-    def __init__(self, db_url: str) -> None:
-        self._engine: AsyncEngine = create_async_engine(db_url, future=True)
-        self._session_factory = sessionmaker(
-            self._engine, class_=AsyncSession, expire_on_commit=False
+    def __init__(
+        self,
+        db_url: str,
+        *,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_recycle: int = 1800,
+    ) -> None:
+        # reuse asyncpg connections across handlers; LIFO keeps the pool warm
+        # and lets idle surplus connections time out
+        self._engine: AsyncEngine = create_async_engine(
+            db_url,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=True,
+            pool_use_lifo=True,
+            # large graph states are (de)serialized with orjson
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
+        )
+        self._session_factory = async_sessionmaker(
+            self._engine, expire_on_commit=False, autoflush=False
         )
 
     def session(self) -> AsyncSession:
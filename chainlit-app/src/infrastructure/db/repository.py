@@ -1,8 +1,9 @@
 # src/infrastructure/db/repository.py
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
+from sqlalchemy import Row, select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,10 +12,12 @@ from .models import LangGraphState
 
 class GraphStateRepository:
 
-    async def get(
-        self, session: AsyncSession, thread_id: str
-    ) -> Optional[LangGraphState]:
-        return await session.get(LangGraphState, thread_id)
+    async def get(self, session: AsyncSession, thread_id: str) -> Optional[Row]:
+        # plain row with only the needed columns: no ORM identity-map bookkeeping
+        stmt = select(LangGraphState.workflow, LangGraphState.state).where(
+            LangGraphState.thread_id == thread_id
+        )
+        return (await session.execute(stmt)).one_or_none()
 
     async def upsert(
         self,
@@ -24,13 +27,22 @@ class GraphStateRepository:
         workflow: str,
         state: Dict[str, Any],
     ) -> None:
-        stmt = (
-            insert(LangGraphState)
-            .values(thread_id=thread_id, workflow=workflow, state=state)
-            .on_conflict_do_update(
-                index_elements=["thread_id"],
-                set_=dict(workflow=workflow, state=state),
-            )
+        await self.upsert_many(
+            session, [dict(thread_id=thread_id, workflow=workflow, state=state)]
+        )
+
+    async def upsert_many(
+        self, session: AsyncSession, rows: Iterable[Dict[str, Any]]
+    ) -> None:
+        # one multi-row INSERT ... ON CONFLICT; a statement may touch each key
+        # only once, so the last row per thread wins
+        rows = list({row["thread_id"]: row for row in rows}.values())
+        if not rows:
+            return
+        stmt = insert(LangGraphState).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["thread_id"],
+            set_=dict(workflow=stmt.excluded.workflow, state=stmt.excluded.state),
         )
         await session.execute(stmt)
         await session.commit()
@@ -1,11 +1,30 @@
 # src/llm/factory.py
 from __future__ import annotations
 
+from functools import cache
 from typing import Any, Optional, Type, List
+
+import httpx
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 
-from core.config import settings
+from core.config import get_settings
+
+
+@cache
+def _get_http_client() -> httpx.AsyncClient:
+    # one keep-alive pool shared by every chat model: no new connection per call
+    return httpx.AsyncClient(
+        timeout=get_settings().llm.timeout,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
+
+
+async def aclose_http_client() -> None:
+    # close the shared client only if some chat model actually created it
+    if _get_http_client.cache_info().currsize:
+        await _get_http_client().aclose()
+        _get_http_client.cache_clear()
 
 
 def create_chat_model(
@@ -13,6 +32,7 @@ def create_chat_model(
     output_model: Optional[Type[Any]] = None,
     tools: Optional[List[Any]] = None,
 ) -> BaseChatModel:
+    settings = get_settings()
     llm: BaseChatModel = ChatOpenAI(
         base_url=settings.llm.base_url,
         api_key="not-used",
@@ -21,6 +41,7 @@ def create_chat_model(
         temperature=settings.llm.temperature,
         timeout=settings.llm.timeout,
         max_retries=settings.llm.max_retries,
+        http_async_client=_get_http_client(),
     )
 
     if output_model:
@@ -1,21 +1,36 @@
 # src/services/graph_service.py
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+from langgraph.graph.state import CompiledStateGraph
+
+from workflows.base import BaseWorkflow
 from workflows.registry import WorkflowRegistry
 
 
 class GraphService:
-    @staticmethod
-    def compile(workflow_name: str):
+    # compiled graphs are session-independent, so build each one once per process
+    _compiled: Dict[str, Tuple[BaseWorkflow, CompiledStateGraph]] = {}
+
+    @classmethod
+    def compile(cls, workflow_name: str) -> Tuple[BaseWorkflow, CompiledStateGraph]:
+        if (cached := cls._compiled.get(workflow_name)) is not None:
+            return cached
         workflow = WorkflowRegistry.create(workflow_name)
         graph = workflow.create_graph()
-        return workflow, graph.compile()
+        cls._compiled[workflow_name] = (workflow, graph.compile())
+        return cls._compiled[workflow_name]
 
-    @staticmethod
-    def create_new_state(workflow_name: str) -> Dict[str, Any]:
-        workflow = WorkflowRegistry.create(workflow_name)
+    @classmethod
+    def get_workflow(cls, workflow_name: str) -> BaseWorkflow:
+        # shared instance: its prompt and chat model are built only once
+        workflow, _ = cls.compile(workflow_name)
+        return workflow
+
+    @classmethod
+    def create_new_state(cls, workflow_name: str) -> Dict[str, Any]:
+        workflow = cls.get_workflow(workflow_name)
         state = workflow.create_default_state()
         state["chat_profile"] = workflow_name
         return state
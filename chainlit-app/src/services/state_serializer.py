@@ -39,9 +39,9 @@ class StateSerializer:
 
     @classmethod
     def _deserialize_messages(cls, data: list[dict]) -> list[BaseMessage]:
-        result: list[BaseMessage] = []
-        for msg in data:
-            msg_type = msg.get("type")
-            msg_cls = cls._message_type_map.get(msg_type, BaseMessage)
-            result.append(msg_cls.model_validate(msg))
-        return result
+        # trusted data written by serialize(): skip pydantic validation
+        type_map = cls._message_type_map
+        return [
+            type_map.get(msg.get("type"), BaseMessage).model_construct(**msg)
+            for msg in data
+        ]
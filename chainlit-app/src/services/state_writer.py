@@ -0,0 +1,90 @@
+# src/services/state_writer.py
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from infrastructure.db.database import Database
+from infrastructure.db.repository import GraphStateRepository
+
+
+class GraphStateWriter:
+    """
+    Write-behind buffer for graph states.
+
+    submit() only records the serialized state; a background task flushes
+    pending states in batches with one multi-row upsert. Repeated saves of
+    the same thread are coalesced, and a state stays visible via pending()
+    until it is committed. Failed writes are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        repo: GraphStateRepository,
+        *,
+        batch_size: int = 100,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+    ) -> None:
+        self._db = db
+        self._repo = repo
+        self._batch_size = batch_size
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, *, thread_id: str, workflow: str, state: Dict[str, Any]) -> None:
+        self._pending[thread_id] = dict(
+            thread_id=thread_id, workflow=workflow, state=state
+        )
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def pending(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        return self._pending.get(thread_id)
+
+    async def drain(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._flush()
+
+    async def _run(self) -> None:
+        delay = self._retry_delay
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if await self._flush():
+                delay = self._retry_delay
+                continue
+            # rows are still pending: retry after a growing delay
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_retry_delay)
+            self._wakeup.set()
+
+    async def _flush(self) -> bool:
+        while self._pending:
+            rows = list(self._pending.values())[: self._batch_size]
+            try:
+                async with self._db.session() as session:
+                    await self._repo.upsert_many(session, rows)
+            except Exception:
+                # keep rows pending until a retry succeeds
+                logger.exception("Failed to save graph states")
+                return False
+            for row in rows:
+                # a newer state may have been submitted while writing
+                if self._pending.get(row["thread_id"]) is row:
+                    del self._pending[row["thread_id"]]
+            logger.info(f"Saved {len(rows)} graph state(s)")
+        return True
@@ -1,10 +1,11 @@
 # src/tools/tool_node.py
 from __future__ import annotations
 
-import json
+import asyncio
 from typing import Dict, List, Optional
 
 import chainlit as cl
+import orjson
 from langchain_core.messages import ToolMessage
 from langchain_core.runnables import Runnable, RunnableConfig
 
@@ -19,20 +20,22 @@ class BasicToolNode(Runnable):
             raise ValueError("No messages found in input")
         message = messages[-1]
 
-        outputs = []
-        for tool_call in getattr(message, "tool_calls", []):
-            tool = self.tools_by_name[tool_call["name"]]
-            async with cl.Step(f"tool [{tool_call['name']}]") as step:
-                tool_result = await tool(**tool_call["args"])
-                outputs.append(
-                    ToolMessage(
-                        content=json.dumps(tool_result, ensure_ascii=False),
-                        name=tool_call["name"],
-                        tool_call_id=tool_call["id"],
-                    )
-                )
-                await step.remove()
-        return {"messages": outputs}
+        # independent tool calls run concurrently; gather keeps their order
+        outputs = await asyncio.gather(
+            *(self._run(tool_call) for tool_call in getattr(message, "tool_calls", []))
+        )
+        return {"messages": list(outputs)}
+
+    async def _run(self, tool_call: Dict) -> ToolMessage:
+        tool = self.tools_by_name[tool_call["name"]]
+        async with cl.Step(f"tool [{tool_call['name']}]") as step:
+            tool_result = await tool(**tool_call["args"])
+            await step.remove()
+        return ToolMessage(
+            content=orjson.dumps(tool_result).decode(),
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+        )
 
     def invoke(self, input: Dict, config: Optional[RunnableConfig] = None) -> Dict:
         raise NotImplementedError("BasicToolNode only supports async invocation")
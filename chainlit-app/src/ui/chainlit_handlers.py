@@ -2,29 +2,44 @@
 from __future__ import annotations
 
 import os
+from functools import cache
 from typing import Dict, Optional
 
 import chainlit as cl
-import chainlit.data as cl_data
 from chainlit.data.sql_alchemy import SQLAlchemyDataLayer
 from chainlit.types import ThreadDict
 from langchain_core.runnables import Runnable
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.config import settings
+from core.config import get_settings
 from infrastructure.db.database import Database
 from infrastructure.db.models import Thread
 from infrastructure.db.repository import GraphStateRepository
+from llm.factory import aclose_http_client
 from services.graph_service import GraphService
 from services.state_serializer import StateSerializer
+from services.state_writer import GraphStateWriter
 from workflows.registry import WorkflowRegistry
 
-db = Database(settings.db_url)
 repo = GraphStateRepository()
 
+
+# settings are read on first use, not at import
+@cache
+def get_db() -> Database:
+    return Database(get_settings().db_url)
+
+
+@cache
+def get_state_writer() -> GraphStateWriter:
+    return GraphStateWriter(get_db(), repo)
+
+
 # plug chainlit datalayer
-cl_data._data_layer = SQLAlchemyDataLayer(conninfo=settings.db_url)
+@cl.data_layer
+def get_data_layer() -> SQLAlchemyDataLayer:
+    return SQLAlchemyDataLayer(conninfo=get_settings().db_url)
 
 
 @cl.password_auth_callback
@@ -50,7 +65,7 @@ async def chat_profile():
 @cl.on_chat_start
 async def on_chat_start():
     # ensure Thread exists
-    async with db.session() as session:
+    async with get_db().session() as session:
         thread = await session.get(Thread, cl.context.session.thread_id)
         if not thread:
             thread = Thread(id=cl.context.session.thread_id)
@@ -63,33 +78,40 @@ async def on_chat_start():
 
 @cl.on_chat_end
 async def on_chat_end():
+    # skip the full-state upsert when nothing changed since start/resume
+    if not cl.user_session.get("state_dirty"):
+        return
+
     state = cl.user_session.get("state")
     workflow_name = state["chat_profile"]
     thread_id = cl.context.session.thread_id
 
-    async with db.session() as session:
-        await repo.upsert(
-            session,
-            thread_id=thread_id,
-            workflow=workflow_name,
-            state=StateSerializer.serialize(state),
-        )
-    logger.info("Saved state")
+    # serialize now, write in the background: DB latency stays off this path
+    get_state_writer().submit(
+        thread_id=thread_id,
+        workflow=workflow_name,
+        state=StateSerializer.serialize(state),
+    )
+    logger.info("Queued state for saving")
 
 
 @cl.on_chat_resume
 async def on_chat_resume(thread: ThreadDict):
-    async with db.session() as session:
-        db_graph = await repo.get(session, thread["id"])
+    # a state that is not written yet is newer than the one in the DB
+    if pending := get_state_writer().pending(thread["id"]):
+        workflow_name, raw_state = pending["workflow"], pending["state"]
+    else:
+        async with get_db().session() as session:
+            db_graph = await repo.get(session, thread["id"])
 
-    if not db_graph:
-        return
+        if not db_graph:
+            return
+        workflow_name, raw_state = db_graph.workflow, db_graph.state
 
-    workflow_name = db_graph.workflow
     workflow, graph = GraphService.compile(workflow_name)
 
-    GraphState = workflow.create_default_state().__class__  # optional
-    state = db_graph.state
+    GraphState = workflow.create_default_state().__class__
+    state = StateSerializer.deserialize(raw_state, GraphState)
     cl.user_session.set("state", state)
     cl.user_session.set("graph", graph)
 
@@ -97,6 +119,12 @@ async def on_chat_resume(thread: ThreadDict):
     logger.info("Chat resumed")
 
 
+@cl.on_app_shutdown
+async def on_app_shutdown():
+    await get_state_writer().drain()
+    await aclose_http_client()
+
+
 @cl.on_settings_update
 async def update_state_by_settings(settings_: cl.ChatSettings):
     state = cl.user_session.get("state")
@@ -104,6 +132,7 @@ async def update_state_by_settings(settings_: cl.ChatSettings):
         if key in state:
             state[key] = settings_[key]
     cl.user_session.set("state", state)
+    cl.user_session.set("state_dirty", True)
 
 
 @cl.on_message
@@ -112,12 +141,19 @@ async def on_message(message: cl.Message):
     state: Dict = cl.user_session.get("state")
 
     workflow_name = state["chat_profile"]
-    workflow = WorkflowRegistry.create(workflow_name)
+    workflow = GraphService.get_workflow(workflow_name)
 
-    state["messages"] += [workflow.format_message(message)]
+    state["messages"].append(workflow.format_message(message))
+    # mark dirty before streaming: a failed turn must still save the message
+    cl.user_session.set("state_dirty", True)
 
     ui_message = None
+    root_run_id = None
     async for event in graph.astream_events(state, version="v1", stream_mode="values"):
+        # the first event belongs to the graph run itself
+        if root_run_id is None:
+            root_run_id = event["run_id"]
+
         if event["event"] == "on_chat_model_stream":
             content = event["data"]["chunk"].content or ""
             if ui_message is None:
@@ -126,7 +162,9 @@ async def on_message(message: cl.Message):
             else:
                 await ui_message.stream_token(token=str(content))
 
-        if event["event"] == "on_chain_end":
+        # only the graph's own end event carries the final state; nested
+        # chains and nodes end with partial outputs
+        if event["event"] == "on_chain_end" and event["run_id"] == root_run_id:
             state = event["data"]["output"]
 
     if ui_message:
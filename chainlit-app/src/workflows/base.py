@@ -1,17 +1,17 @@
 # src/workflows/base.py
 from __future__ import annotations
 
-import operator
 from abc import ABC, abstractmethod
-from typing import TypedDict, Annotated, Sequence, Optional, Any, Dict
+from typing import TypedDict, Annotated, Optional, Any, Dict
 
 import chainlit as cl
 from langchain_core.messages import AnyMessage, HumanMessage
 from langgraph.graph import END, StateGraph
+from langgraph.graph.message import add_messages
 
 
 class BaseState(TypedDict):
-    messages: Annotated[Sequence[AnyMessage], operator.add]
+    messages: Annotated[list[AnyMessage], add_messages]
     chat_profile: str
 
 
@@ -39,7 +39,8 @@ class BaseWorkflow(ABC):
     def create_default_state(self) -> Dict[str, Any]: ...
 
     def format_message(self, message: cl.Message) -> HumanMessage:
-        return HumanMessage(content=message.content)
+        # Chainlit message content is always a plain str: skip validation
+        return HumanMessage.model_construct(content=message.content, type="human")
 
     def tool_routing(self, state: BaseState):
         if messages := state.get("messages", []):
@@ -13,6 +13,7 @@ from .base import BaseWorkflow
 class WorkflowMeta:
     name: str
     workflow_cls: Type[BaseWorkflow]
+    profile: cl.ChatProfile
 
 
 class WorkflowRegistry:
@@ -21,7 +22,10 @@ class WorkflowRegistry:
     @classmethod
     def register(cls, workflow_cls: Type[BaseWorkflow]) -> None:
         name = workflow_cls.name()
-        cls._items[name] = WorkflowMeta(name=name, workflow_cls=workflow_cls)
+        # profiles are static, so build them once at registration
+        cls._items[name] = WorkflowMeta(
+            name=name, workflow_cls=workflow_cls, profile=workflow_cls.chat_profile()
+        )
 
     @classmethod
     def list_names(cls) -> List[str]:
@@ -35,7 +39,7 @@ class WorkflowRegistry:
 
     @classmethod
     def chat_profiles(cls) -> List[cl.ChatProfile]:
-        return [m.workflow_cls.chat_profile() for m in cls._items.values()]
+        return [m.profile for m in cls._items.values()]
 
 
 def workflow(cls: Type[BaseWorkflow]) -> Type[BaseWorkflow]:
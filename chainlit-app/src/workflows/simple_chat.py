@@ -5,7 +5,7 @@ import chainlit as cl
 from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import Runnable, RunnableConfig
-from langgraph.graph import StateGraph
+from langgraph.graph import END, StateGraph
 
 from llm.factory import create_chat_model
 from tools.time import get_datetime_now
@@ -23,6 +23,15 @@ class GraphState(BaseState):
 class SimpleChatWorkflow(BaseWorkflow):
     def __init__(self) -> None:
         self.tools = [get_datetime_now]
+        # build the chain once instead of on every turn
+        self._prompt = ChatPromptTemplate.from_messages(
+            [
+                SystemMessage(content="You're a helpful assistant."),
+                MessagesPlaceholder(variable_name="messages"),
+            ]
+        )
+        self._llm = create_chat_model(tools=self.tools)
+        self._chain: Runnable = self._prompt | self._llm
 
     @classmethod
     def name(cls) -> str:
@@ -61,15 +70,9 @@ class SimpleChatWorkflow(BaseWorkflow):
         graph.add_edge("tools", "chat")
         return graph
 
-    async def chat_node(self, state: GraphState, config: RunnableConfig) -> GraphState:
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                SystemMessage(content="You're a helpful assistant."),
-                MessagesPlaceholder(variable_name="messages"),
-            ]
-        )
-
-        llm = create_chat_model(tools=self.tools)
-        chain: Runnable = prompt | llm
+    def tool_routing(self, state: GraphState):
+        # routed only after "chat", whose last message is always an AIMessage
+        return "tools" if state["messages"][-1].tool_calls else END
 
-        return {"messages": [await chain.ainvoke(state, config=config)]}
+    async def chat_node(self, state: GraphState, config: RunnableConfig) -> GraphState:
+        return {"messages": [await self._chain.ainvoke(state, config=config)]}